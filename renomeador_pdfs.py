@@ -1,10 +1,19 @@
+import hashlib
+import json
+import mmap
 import os
 import re
 import shutil
+import threading
+import time
 import unicodedata
 from pathlib import Path
 from datetime import datetime
-from tkinter import Tk, Label, END, StringVar, Frame
+from functools import lru_cache
+from itertools import chain, count
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import freeze_support
+from tkinter import Tk, Label, END, StringVar, BooleanVar, Frame, Checkbutton
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
 import sys
@@ -14,6 +23,10 @@ try:
     import fitz  # PyMuPDF
 except Exception:
     fitz = None
+try:
+    import pypdfium2 as pdfium
+except Exception:
+    pdfium = None
 try:
     from PyPDF2 import PdfReader
 except Exception:
@@ -21,6 +34,7 @@ except Exception:
 
 # --------- Excel deps ----------
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
@@ -33,62 +47,359 @@ def get_base_dir() -> Path:
         return Path(sys.executable).parent
     return Path(__file__).parent
 
-def strip_accents(s: str) -> str:
+def list_pdfs(folder: Path) -> list[Path]:
+    """
+    PDFs da pasta (extensão sem diferenciar maiúsculas), em ordem de nome; uma só passada de scandir.
+    Pasta inexistente devolve lista vazia, como o glob fazia.
+    """
+    try:
+        with os.scandir(folder) as it:
+            pdfs = [Path(e.path) for e in it if e.name.lower().endswith(".pdf") and e.is_file()]
+    except FileNotFoundError:
+        return []
+    pdfs.sort(key=lambda p: p.name)
+    return pdfs
+
+class _CharTable(dict):
+    """Tabela para str.translate que calcula (e guarda) o valor de um caractere na 1ª vez que aparece."""
+    def __init__(self, fn, seed=None):
+        super().__init__(seed or {})
+        self._fn = fn
+
+    def __missing__(self, cp: int):
+        value = self[cp] = self._fn(chr(cp))
+        return value
+
+def _strip_accents_nfd(s: str) -> str:
     return ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
 
-def only_digits(s: str) -> str:
-    return re.sub(r"\D", "", s)
+# Latin-1 (todo o português) resolvido no import pelo próprio NFD; os demais
+# caracteres caem no NFD sob demanda (uma vez por caractere)
+_ACCENT_MAP = _CharTable(_strip_accents_nfd, {cp: _strip_accents_nfd(chr(cp)) for cp in range(0x100)})
 
-def read_pdf_text(pdf_path: Path) -> str:
-    """Tenta extrair texto do PDF via PyMuPDF; se falhar, tenta PyPDF2."""
-    text_parts = []
-    if fitz is not None:
+def strip_accents(s: str) -> str:
+    if s.isascii():
+        return s
+    return s.translate(_ACCENT_MAP)
+
+def normalize_text(s: str) -> str:
+    """Forma usada por todos os extratores: sem acentos e em maiúsculas."""
+    return strip_accents(s).upper()
+
+def _keep_digit(c: str) -> str | None:
+    return c if c.isdecimal() else None
+
+# Mantém os dígitos (mesmos caracteres que \d) e apaga todo o resto. Latin-1 resolvido
+# no import; dígitos de outros alfabetos (raros em PDF brasileiro) entram sob demanda
+# e continuam aceitos, como no \d — o int() da validação do CPF os converte.
+_KEEP_DIGITS = _CharTable(_keep_digit, {cp: _keep_digit(chr(cp)) for cp in range(0x100)})
+
+def only_digits(s: str) -> str:
+    return s.translate(_KEEP_DIGITS)
+
+# Páginas lidas por PDF: CPF, contrato e nome ficam no início do documento.
+# A leitura já para na página em que tudo foi encontrado; o teto só limita os
+# casos em que algum campo não aparece (ajustável por chamada em _scan_pdf).
+MAX_PAGES = 5
+
+# Flags mínimas do PyMuPDF: sem preservar ligaduras/espaços (os extratores já
+# normalizam espaços e acentos); mantém só o recorte na área da página.
+_FITZ_TEXT_FLAGS = getattr(fitz, "TEXT_MEDIABOX_CLIP", 0)
+
+def _iter_fitz_pages(pdf_path: Path, max_pages: int | None):
+    with fitz.open(pdf_path) as doc:
+        n = doc.page_count if max_pages is None else min(max_pages, doc.page_count)
+        for i in range(n):
+            yield doc.load_page(i).get_text("text", flags=_FITZ_TEXT_FLAGS)
+
+def _iter_pdfium_pages(pdf_path: Path, max_pages: int | None):
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        n = len(pdf) if max_pages is None else min(max_pages, len(pdf))
+        for i in range(n):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+# A partir deste tamanho o PyPDF2 lê o arquivo por mmap em vez de copiá-lo para a memória
+MMAP_MIN_SIZE = 256 * 1024
+
+def _pypdf2_pages(reader, max_pages: int | None):
+    n = len(reader.pages) if max_pages is None else min(max_pages, len(reader.pages))
+    for i in range(n):
+        yield reader.pages[i].extract_text() or ""
+
+def _iter_pypdf2_pages(pdf_path: Path, max_pages: int | None):
+    # PdfReader(caminho) lê o arquivo inteiro para um BytesIO; com mmap as páginas
+    # são lidas direto do cache do SO. (PyMuPDF e pypdfium2 já leem do arquivo.)
+    if pdf_path.stat().st_size < MMAP_MIN_SIZE:
+        yield from _pypdf2_pages(PdfReader(str(pdf_path)), max_pages)
+        return
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield from _pypdf2_pages(PdfReader(mm), max_pages)
+
+def _extract_pages(pdf_path: Path, max_pages: int | None):
+    """
+    Ordem: PyMuPDF → pypdfium2 → PyPDF2; só passa ao próximo se o anterior não trouxe texto.
+    Só as páginas do backend que trouxe texto são entregues (as em branco do início ficam
+    retidas até aparecer texto), para que páginas de backends diferentes nunca se misturem.
+    """
+    backends = [
+        (fitz, _iter_fitz_pages),
+        (pdfium, _iter_pdfium_pages),
+        (PdfReader, _iter_pypdf2_pages),
+    ]
+    for lib, iter_pages in backends:
+        if lib is None:
+            continue
+        got_text = False
+        blank = []
         try:
-            with fitz.open(pdf_path) as doc:
-                for page in doc:
-                    text_parts.append(page.get_text("text"))
+            for page_text in iter_pages(pdf_path, max_pages):
+                if got_text:
+                    yield page_text
+                elif page_text.strip():
+                    got_text = True
+                    yield from blank
+                    yield page_text
+                else:
+                    blank.append(page_text)
         except Exception:
             pass
-    text = "\n".join(text_parts).strip()
-    if not text and PdfReader is not None:
+        if got_text:
+            return
+
+# --------- Cache do texto extraído (por arquivo, invalidado por mtime/tamanho) ---------
+
+CACHE_DIR = get_base_dir() / ".text_cache"
+CACHE_VERSION = 3  # incrementar quando a extração mudar (flags, backends...)
+
+def _cache_file(src: str) -> Path:
+    return CACHE_DIR / (hashlib.sha1(src.encode("utf-8")).hexdigest() + ".json")
+
+def _cache_key(pdf_path: Path) -> list[int]:
+    st = pdf_path.stat()
+    return [CACHE_VERSION, st.st_mtime_ns, st.st_size]
+
+def _text_cache_load(src: str, key: list[int]) -> tuple[list[str], bool]:
+    """Páginas já extraídas deste PDF e se o documento foi lido até o fim."""
+    try:
+        entry = json.loads(_cache_file(src).read_text(encoding="utf-8"))
+        if entry["key"] == key:
+            return entry["pages"], entry["complete"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return [], False
+
+def _text_cache_save(src: str, key: list[int], pages: list[str], complete: bool):
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        entry = {"src": src, "key": key, "pages": pages, "complete": complete}
+        dest = _cache_file(src)
+        tmp = dest.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, dest)
+    except OSError:
+        pass  # sem cache (pasta somente leitura etc.): segue normalmente
+
+def evict_text_cache():
+    """Remove do cache as entradas cujo PDF de origem sumiu ou mudou."""
+    if not CACHE_DIR.is_dir():
+        return
+    for f in CACHE_DIR.glob("*.json"):
         try:
-            reader = PdfReader(str(pdf_path))
-            text = "\n".join([p.extract_text() or "" for p in reader.pages])
-        except Exception:
+            entry = json.loads(f.read_text(encoding="utf-8"))
+            src = Path(entry["src"])
+            if src.exists() and entry["key"] == _cache_key(src):
+                continue
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        try:
+            f.unlink()
+        except OSError:
             pass
-    return text
 
-def validate_cpf(cpf: str) -> bool:
-    cpf = only_digits(cpf)
+def iter_pdf_pages(pdf_path: Path, max_pages: int | None = MAX_PAGES):
+    """
+    Gera o texto do PDF página a página (até 'max_pages'; None = todas), para que o
+    chamador pare assim que encontrar o que procura.
+    As páginas já lidas numa execução anterior vêm do cache em disco, sem abrir o PDF;
+    as que forem lidas agora são gravadas no cache ao final (mesmo se o chamador parar antes).
+    """
+    # caminho e stat uma vez só por PDF; a chave tirada antes da leitura faz uma
+    # alteração do arquivo durante a extração invalidar o cache na próxima vez
+    src = str(pdf_path.resolve())
+    key = _cache_key(pdf_path)
+    pages, complete = _text_cache_load(src, key)
+    yield from pages[:max_pages]
+    if complete or (max_pages is not None and len(pages) >= max_pages):
+        return
+
+    # re-extrai desde o início (sequência determinística), entregando só o que falta
+    fresh = []
+    finished = False
+    try:
+        for i, page_text in enumerate(_extract_pages(pdf_path, max_pages)):
+            fresh.append(page_text)
+            if i >= len(pages):
+                yield page_text
+        finished = True
+    finally:
+        if len(fresh) > len(pages) or finished:
+            _text_cache_save(src, key, fresh, finished and (max_pages is None or len(fresh) < max_pages))
+
+def _accumulate_pages(pdf_path: Path, max_pages: int | None = MAX_PAGES):
+    """
+    Gera (texto, texto normalizado) acumulados a cada página lida. A normalização
+    (normalize_text) é feita uma vez por página e compartilhada pelos extratores.
+    """
+    text = norm = ""
+    for page_text in iter_pdf_pages(pdf_path, max_pages):
+        if not text:
+            page_text = page_text.lstrip()
+            if not page_text:
+                continue
+            text, norm = page_text, normalize_text(page_text)
+        else:
+            text += "\n" + page_text
+            norm += "\n" + normalize_text(page_text)
+        yield text, norm
+
+def _scan_pdf(pdf_path: Path, extract, done=bool, max_pages: int | None = MAX_PAGES):
+    """
+    Lê o PDF página a página aplicando extract(texto, normalizado) ao texto acumulado
+    e para assim que done(resultado) for verdadeiro (ou após 'max_pages'). Retorna (texto, normalizado, resultado);
+    texto vazio indica PDF sem texto.
+    """
+    text = norm = ""
+    result = None
+    for text, norm in _accumulate_pages(pdf_path, max_pages):
+        result = extract(text, norm)
+        if done(result):
+            break  # tudo encontrado: não lê as páginas seguintes
+    return text, norm, result
+
+def read_pdf_text(pdf_path: Path, max_pages: int | None = None) -> str:
+    """Texto completo do PDF (ou das primeiras 'max_pages' páginas)."""
+    return "\n".join(iter_pdf_pages(pdf_path, max_pages)).strip()
+
+@lru_cache(maxsize=4096)
+def _validate_cpf_digits(cpf: str) -> bool:
+    """Valida um CPF já reduzido a dígitos. Memoizado: o mesmo candidato reaparece
+    várias vezes por PDF (rótulo, padrões, fullscan e a releitura a cada página)."""
     if len(cpf) != 11 or cpf == cpf[0]*11:
         return False
-    soma = sum(int(cpf[i])*(10-i) for i in range(9))
-    dv1 = (soma*10) % 11
-    if dv1 == 10:
-        dv1 = 0
-    if dv1 != int(cpf[9]):
+    d0, d1, d2, d3, d4, d5, d6, d7, d8, d9, d10 = map(int, cpf)
+    # somas ponderadas desenroladas (pesos 10..2 e 11..2); "% 10" transforma o resto 10 em 0
+    s1 = d0*10 + d1*9 + d2*8 + d3*7 + d4*6 + d5*5 + d6*4 + d7*3 + d8*2
+    if s1 * 10 % 11 % 10 != d9:
         return False
-    soma = sum(int(cpf[i])*(11-i) for i in range(10))
-    dv2 = (soma*10) % 11
-    if dv2 == 10:
-        dv2 = 0
-    return dv2 == int(cpf[10])
+    # pesos 11..2 = pesos 10..2 + 1 em d0..d8, e peso 2 em d9
+    s2 = s1 + d0 + d1 + d2 + d3 + d4 + d5 + d6 + d7 + d8 + d9*2
+    return s2 * 10 % 11 % 10 == d10
+
+def validate_cpf(cpf: str) -> bool:
+    return _validate_cpf_digits(only_digits(cpf))
+
+def _fast_copy(src: Path, dest: Path):
+    """
+    Copia o conteúdo de 'src' para 'dest' (já reservado). No Linux usa copy_file_range:
+    em Btrfs/XFS o kernel clona os blocos (reflink) sem ler nem gravar dados.
+    Se não houver suporte, cai no shutil.copyfile.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "r+b") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            if remaining <= 0:
+                return
+        except OSError:
+            pass  # kernel antigo, outro volume sem suporte...: cópia comum
+    shutil.copyfile(src, dest)
+
+def _emit(src: Path, outdir: Path, novo: str, alt: str, link: bool = False,
+          taken: set[str] | None = None) -> Path:
+    """
+    Grava 'src' em 'outdir' com o primeiro nome livre ('alt' recebe o contador {i}).
+    Nomes em 'taken' (retrato da pasta de saída mais o que o lote já gravou) são pulados
+    sem tocar no disco; o nome escolhido entra no conjunto.
+    Por padrão copia só o conteúdo. Com link=True usa hardlink (nenhum dado copiado; apagar
+    o original não apaga o renomeado, mas editar um altera o outro, pois são o mesmo
+    arquivo); se o volume não suportar hardlink, copia.
+    O link e a criação exclusiva falham se o nome já existe, então um arquivo que
+    apareceu depois do retrato nunca é sobrescrito.
+    """
+    for name in chain([novo], (alt.format(i=i) for i in count(1))):
+        if taken is not None and name in taken:
+            continue
+        dest = outdir / name
+        if link:
+            try:
+                os.link(src, dest)
+                break
+            except FileExistsError:
+                continue
+            except OSError:
+                link = False  # sem suporte a hardlink (outro volume, FAT...): cópia
+        try:
+            with open(dest, "xb"):
+                pass
+        except FileExistsError:
+            continue
+        _fast_copy(src, dest)
+        break
+    if taken is not None:
+        taken.add(dest.name)
+    return dest
+
+def _emit_plan(pdf: Path, outdir: Path, plan: tuple, link: bool = False,
+               taken: set[str] | None = None) -> tuple[str, str, str]:
+    """Grava o resultado de um _plan_* ((orig, (novo, alt) ou None, status)) e devolve a linha do log."""
+    orig, names, status = plan
+    if names is None:
+        return (orig, "", status)
+    dest = _emit(pdf, outdir, *names, link=link, taken=taken)
+    return (orig, dest.name, status)
 
 
 # ===================== Regras de extração =====================
 
+# CPF do comprador, nome e ofício ficam na 1ª página: os extratores só olham o início do texto
+SEARCH_WINDOW = 32768
+
 # Aceitar vários tipos de hífen/traço usados em PDFs (U+002D, U+2010..U+2014, U+2212)
 _HYPHENS = r"\-\u2010\u2011\u2012\u2013\u2014\u2212"
 _SEP = f"[. {_HYPHENS}]"
 
+# Quantificadores possessivos (re do Python 3.11+): o que já casou não é devolvido,
+# o que limita o retrocesso em sequências longas de dígitos e separadores do OCR.
+# Nos padrões abaixo o resultado é o mesmo com ou sem eles.
+_POSSESSIVE = "+" if sys.version_info >= (3, 11) else ""
+
 # CPF com separadores variados (ou ausentes no fallback ANY11)
 CPF_REGEX = re.compile(
-    rf"\b\d{{3}}(?:{_SEP}?\d{{3}}){{2}}(?:{_SEP}?\d{{2}})\b"
+    rf"\b\d{{3}}(?:{_SEP}?{_POSSESSIVE}\d{{3}}){{2}}(?:{_SEP}?{_POSSESSIVE}\d{{2}})\b"
 )
 CPF_ANY11_REGEX = re.compile(r"\b\d{11}\b")
 
 # Âncora principal do COMPRADOR
 ANCHOR_PRINCIPAL = r"DORAVANTE\s+DENOMINADO\(S\)\s+DEVEDOR\(ES\)\s*:"
+ANCHOR_PRINCIPAL_REGEX = re.compile(ANCHOR_PRINCIPAL)
+
+def _find_anchor_principal(norm: str) -> re.Match | None:
+    # teste de substring (C, sem motor de regex) antes: a âncora exige 'DORAVANTE' literal
+    return ANCHOR_PRINCIPAL_REGEX.search(norm) if "DORAVANTE" in norm else None
 
 # âncoras alternativas para fallback
 ANCHORS_FALLBACK = [
@@ -99,6 +410,48 @@ ANCHORS_FALLBACK = [
     r"\bADQUIRENTE\b"
 ]
 
+@lru_cache(maxsize=None)
+def _anchor_alternation(anchors: tuple[str, ...]) -> re.Pattern:
+    """Junta uma lista de âncoras (em ordem de prioridade) numa única regex com grupos nomeados."""
+    return re.compile("|".join(f"(?P<a{i}>{rgx})" for i, rgx in enumerate(anchors)))
+
+@lru_cache(maxsize=None)
+def _anchor_patterns(anchors: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    return tuple(re.compile(rgx) for rgx in anchors)
+
+def _iter_anchor_matches(anchors: tuple[str, ...], text: str):
+    """
+    Gera, em ordem de prioridade, a 1ª ocorrência de cada âncora presente em 'text' —
+    o mesmo que um re.search por âncora, mas com uma só varredura preguiçosa
+    (avança só o necessário e reaproveita o que já viu para as âncoras seguintes).
+    """
+    rx = _anchor_alternation(anchors)
+    singles = _anchor_patterns(anchors)
+    found = {}
+    pos = 0
+    exhausted = False
+    for k in range(len(anchors)):
+        while k not in found and not exhausted:
+            m = rx.search(text, pos)
+            if m is None:
+                exhausted = True
+                break
+            start = m.start()
+            first = int(m.lastgroup[1:])
+            found.setdefault(first, m)
+            # a alternação só informa a 1ª âncora que casa aqui; as seguintes podem casar
+            # na mesma posição (ex.: 'FOO\s+BAR' e 'FOO') e são testadas uma a uma
+            for j in range(first + 1, len(anchors)):
+                if j not in found:
+                    mj = singles[j].match(text, start)
+                    if mj:
+                        found[j] = mj
+            pos = start + 1  # +1 e não m.end(): âncoras podem se sobrepor
+        if k in found:
+            yield found[k]
+
+ANCHORS_FALLBACK_REGEX = _anchor_alternation(tuple(ANCHORS_FALLBACK))
+
 # Âncoras de término da seção do comprador
 END_ANCHORS = [
     r"\bCONSTRUTORA\s+E\s+FIADORA\b",
@@ -112,106 +465,94 @@ END_ANCHORS = [
     r"\bOBJETO\b",
     r"\bTESTEMUNHA(?:S)?\b"
 ]
+# uma só busca: a alternação casa na posição mais à esquerda entre todas as âncoras
+END_ANCHORS_REGEX = re.compile("|".join(f"(?:{p})" for p in END_ANCHORS), flags=re.IGNORECASE | re.DOTALL)
 
 # Rótulo de CPF tolerante: “CPF”, “C P F”, “C.P.F.”
 CPF_LABEL_TOLERANT = re.compile(r"\bC\s*\.?\s*P\s*\.?\s*F\b", flags=re.IGNORECASE)
 
 def _first_end_after(start: int, norm_text: str) -> int:
     """Retorna o índice (em norm_text) do primeiro fim de seção após 'start'."""
-    end = len(norm_text)
-    for pat in END_ANCHORS:
-        m = re.search(pat, norm_text[start:], flags=re.IGNORECASE | re.DOTALL)
-        if m:
-            cand = start + m.start()
-            if cand < end:
-                end = cand
-    return end
+    m = END_ANCHORS_REGEX.search(norm_text, start)
+    return m.start() if m else len(norm_text)
 
 def _extract_cpf_by_label_window(section: str, window_ahead: int = 240) -> str | None:
     """Após o rótulo 'CPF', coleta 11 dígitos à frente (ignorando pontuação)."""
     for m in CPF_LABEL_TOLERANT.finditer(section):
         start = m.end()
-        window = section[start: start + window_ahead]
-        digits = re.findall(r"\d", window)
-        if len(digits) >= 11:
-            candidate = "".join(digits[:11])
-            if validate_cpf(candidate):
-                return candidate
+        candidate = only_digits(section[start: start + window_ahead])[:11]
+        if len(candidate) == 11 and _validate_cpf_digits(candidate):
+            return candidate
     return None
 
-def extract_cpf_first_buyer(text: str) -> tuple[str | None, str]:
+def _extract_cpf_in_section(section: str) -> str | None:
+    """Rótulo 'CPF' primeiro; depois o 1º padrão formatado; depois o 1º bloco de 11 dígitos."""
+    cpf = _extract_cpf_by_label_window(section)
+    if cpf:
+        return cpf
+    m = CPF_REGEX.search(section)
+    if m:
+        cand = only_digits(m.group(0))
+        if _validate_cpf_digits(cand):
+            return cand
+    m = CPF_ANY11_REGEX.search(section)
+    if m and _validate_cpf_digits(m.group(0)):
+        return m.group(0)
+    return None
+
+def _first_valid_cpf(matches: list[str]) -> str | None:
+    """Primeiro CPF válido entre os trechos de um findall (filtragem em lote, sem laço Python)."""
+    return next(filter(_validate_cpf_digits, map(only_digits, matches)), None)
+
+def extract_cpf_first_buyer(text: str, norm: str | None = None) -> tuple[str | None, str]:
     """
     1) Seção ancorada por 'doravante denominado(s) DEVEDOR(ES):'
     2) Busca CPF pós-rótulo; fallback para padrões válidos; último recurso: fullscan.
+    'norm' é normalize_text(text), quando o chamador já o tiver calculado.
     """
     if not text or not text.strip():
         return None, "ERRO: PDF sem texto"
 
-    norm = strip_accents(text).upper()
+    text = text[:SEARCH_WINDOW]
+    norm = norm[:SEARCH_WINDOW] if norm is not None else normalize_text(text)
 
     # 1) tentativa principal
-    m_main = re.search(ANCHOR_PRINCIPAL, norm)
+    m_main = _find_anchor_principal(norm)
     if m_main:
         start_pos = m_main.end()
         end_pos = _first_end_after(start_pos, norm)
         end_pos = max(end_pos, start_pos)
         section = text[start_pos: start_pos + min(25000, end_pos - start_pos or 25000)]
 
-        cpf = _extract_cpf_by_label_window(section)
+        cpf = _extract_cpf_in_section(section)
         if cpf:
             return cpf, "OK"
 
-        m = CPF_REGEX.search(section)
-        if m and validate_cpf(only_digits(m.group(0))):
-            return only_digits(m.group(0)), "OK"
-
-        m = CPF_ANY11_REGEX.search(section)
-        if m and validate_cpf(m.group(0)):
-            return m.group(0), "OK"
-
         return None, "ERRO: CPF não encontrado após âncora principal"
 
     # 2) fallback: âncoras alternativas
-    for rgx in ANCHORS_FALLBACK:
-        m_fb = re.search(rgx, norm)
-        if not m_fb:
-            continue
+    for m_fb in _iter_anchor_matches(tuple(ANCHORS_FALLBACK), norm):
         start_pos = m_fb.end()
         end_pos = _first_end_after(start_pos, norm)
         end_pos = max(end_pos, start_pos)
         section = text[start_pos: start_pos + min(15000, end_pos - start_pos or 15000)]
 
-        cpf = _extract_cpf_by_label_window(section)
+        cpf = _extract_cpf_in_section(section)
         if cpf:
             return cpf, "⚠️ Âncora principal não encontrada, CPF via fallback"
 
-        m = CPF_REGEX.search(section)
-        if m and validate_cpf(only_digits(m.group(0))):
-            return only_digits(m.group(0)), "⚠️ Âncora principal não encontrada, CPF via fallback"
-
-        m = CPF_ANY11_REGEX.search(section)
-        if m and validate_cpf(m.group(0)):
-            return m.group(0), "⚠️ Âncora principal não encontrada, CPF via fallback"
-
     # 3) fullscan (priorizando ainda o rótulo)
     m = CPF_LABEL_TOLERANT.search(text)
     if m:
-        w = text[m.end(): m.end() + 240]
-        digits = re.findall(r"\d", w)
-        if len(digits) >= 11:
-            candidate = "".join(digits[:11])
-            if validate_cpf(candidate):
-                return candidate, "⚠️ Âncora não encontrada, CPF via fullscan"
-
-    for m in CPF_REGEX.finditer(text):
-        cand = only_digits(m.group(0))
-        if validate_cpf(cand):
-            return cand, "⚠️ Âncora não encontrada, CPF via fullscan"
+        candidate = only_digits(text[m.end(): m.end() + 240])[:11]
+        if len(candidate) == 11 and _validate_cpf_digits(candidate):
+            return candidate, "⚠️ Âncora não encontrada, CPF via fullscan"
 
-    for m in CPF_ANY11_REGEX.finditer(text):
-        cand = m.group(0)
-        if validate_cpf(cand):
-            return cand, "⚠️ Âncora não encontrada, CPF via fullscan"
+    # todo bloco isolado de 11 dígitos (CPF_ANY11_REGEX) também é um candidato de
+    # CPF_REGEX (separadores opcionais), na mesma ordem: uma varredura só basta
+    cand = _first_valid_cpf(CPF_REGEX.findall(text))
+    if cand:
+        return cand, "⚠️ Âncora não encontrada, CPF via fullscan"
 
     return None, "ERRO: Nenhum CPF válido encontrado"
 
@@ -220,15 +561,24 @@ def extract_cpf_first_buyer(text: str) -> tuple[str | None, str]:
 
 # Aceita também Nº / N° / No, com pontuação opcional
 _N_LABEL = r"N[\s\.\-º°O]*"
+N_LABEL_REGEX = re.compile(_N_LABEL, flags=re.IGNORECASE)
+
+# 'CONTRATO' e até 300 caracteres depois dele (só para localizar a região).
+# A cauda limitada evita varrer parágrafos inteiros quando a linha é longa.
+CONTRATO_TAIL_REGEX = re.compile(r"CONTRATO(?P<after>.{0,300})", flags=re.IGNORECASE)
+
+# Blocos numéricos longos (dígitos, hífens, pontos e espaços)
+NUM_BLOCK_REGEX = re.compile(rf"[0-9{_HYPHENS}\.\s]{{13,}}{_POSSESSIVE}")
 
 def _take_first_13_digits(s: str) -> str | None:
     """Retorna os primeiros 13 dígitos encontrados na string."""
-    ds = re.findall(r"\d", s)
-    if len(ds) >= 13:
-        return "".join(ds[:13])
-    return None
+    ds = only_digits(s)[:13]
+    return ds if len(ds) == 13 else None
+
+def _count_digits(s: str) -> int:
+    return len(only_digits(s))
 
-def extract_contract_number(text: str) -> str | None:
+def extract_contract_number(text: str, norm: str | None = None, header_fallback: bool = True) -> str | None:
     """
     Estratégia:
       A) Procurar linhas que contenham 'CONTRATO'. Tentar na própria linha e na seguinte:
@@ -236,38 +586,35 @@ def extract_contract_number(text: str) -> str | None:
          - Isso evita capturar a numeração de página ao final da linha.
       B) Fallback curto (OCR 'quebrado'): nas primeiras ~40 linhas, procurar linhas com rótulo de número (Nº/No/N°)
          e extrair os PRIMEIROS 13 dígitos após o rótulo (preferir linhas que também contenham 'CONTR').
+         Com header_fallback=False só a estratégia A é usada (leitura progressiva das páginas).
+    'norm' é normalize_text(text), quando o chamador já o tiver calculado.
     """
     if not text:
         return None
 
     lines_orig = text.splitlines()
-    lines_norm = [strip_accents(l).upper() for l in lines_orig]
+    if norm is not None:
+        lines_norm = norm.splitlines()  # a normalização não cria nem remove quebras de linha
+    else:
+        lines_norm = [normalize_text(l) for l in lines_orig]
 
     # Linhas com 'CONTRATO'
     candidate_idxs = [i for i, ln in enumerate(lines_norm) if "CONTRATO" in ln]
 
-    # Regex para localizar 'CONTRATO' e depois um rótulo N...
-    # (usamos só para achar a região; a extração final é "primeiros 13 dígitos após")
-    num_after_contrato_regex = re.compile(
-        rf"CONTRATO(?P<after>.*)",  # pega tudo após 'CONTRATO'
-        flags=re.IGNORECASE
-    )
-    nlabel_regex = re.compile(_N_LABEL, flags=re.IGNORECASE)
-
     def try_window(idx: int) -> str | None:
         # janela: linha do 'CONTRATO' + próxima (para contornar quebras)
         win = lines_orig[idx]
         if idx + 1 < len(lines_orig):
             win += " " + lines_orig[idx + 1]
 
-        m_contrato = num_after_contrato_regex.search(win)
+        m_contrato = CONTRATO_TAIL_REGEX.search(win)
         if not m_contrato:
             return None
 
         tail = m_contrato.group("after")
 
         # 1) Se existir rótulo N... dentro da janela, pegar a partir dele
-        m_n = nlabel_regex.search(tail)
+        m_n = N_LABEL_REGEX.search(tail)
         if m_n:
             sub = tail[m_n.end():]
             n = _take_first_13_digits(sub)
@@ -280,9 +627,9 @@ def extract_contract_number(text: str) -> str | None:
             return n
 
         # 3) Fallback dentro da janela: maior trecho numérico e primeiros 13 dígitos
-        candidates = re.findall(rf"[0-9{_HYPHENS}\.\s]{{13,}}", tail)
+        candidates = NUM_BLOCK_REGEX.findall(tail)
         if candidates:
-            best = max(candidates, key=lambda s: len(re.findall(r"\d", s)))
+            best = max(candidates, key=_count_digits)
             n = _take_first_13_digits(best)
             if n:
                 return n
@@ -293,23 +640,26 @@ def extract_contract_number(text: str) -> str | None:
         if n:
             return n
 
+    if not header_fallback:
+        return None
+
     # Fallback curto: primeiras ~40 linhas que tenham rótulo N... (preferir com 'CONTR')
     limit = min(40, len(lines_orig))
     for i in range(limit):
         ln = lines_orig[i]
         ln_up = lines_norm[i]
-        if nlabel_regex.search(ln_up) and ("CONTR" in ln_up or i < 10):
+        if N_LABEL_REGEX.search(ln_up) and ("CONTR" in ln_up or i < 10):
             # pegar texto após o rótulo e extrair os PRIMEIROS 13 dígitos
-            m = nlabel_regex.search(ln)
+            m = N_LABEL_REGEX.search(ln)
             sub = ln[m.end():] if m else ln
             n = _take_first_13_digits(sub)
             if n:
                 return n
 
             # fallback: maior bloco numérico na linha e PRIMEIROS 13 dígitos
-            candidates = re.findall(rf"[0-9{_HYPHENS}\.\s]{{13,}}", ln)
+            candidates = NUM_BLOCK_REGEX.findall(ln)
             if candidates:
-                best = max(candidates, key=lambda s: len(re.findall(r"\d", s)))
+                best = max(candidates, key=_count_digits)
                 n = _take_first_13_digits(best)
                 if n:
                     return n
@@ -317,112 +667,134 @@ def extract_contract_number(text: str) -> str | None:
     return None
 
 
-def extract_nome_until_comma(text: str, anchors_regexes: list[str]) -> str | None:
-    raw = text
-    up = strip_accents(raw.upper())
-    start_pos = None
-    for rgx in anchors_regexes:
-        m = re.search(rgx, up)
-        if m:
-            start_pos = m.end()
-            break
-    if start_pos is None:
-        return None
+# Limpeza do nome e detecção do 6º ofício
+NON_ALPHA_REGEX = re.compile(r"[^A-Z \n]")
+WS_REGEX = re.compile(r"\s+")
+OFICIO_6_REGEX = re.compile(r"\b6[ºO]?\s*OFICIO\b")
+
+# Palavras que encerram o nome quando não há vírgula logo após ele
+STOPWORDS_POS_NOME = [
+    r"\bCPF\b", r"\bRG\b", r"\bCNH\b", r"\bCTPS\b",
+    r"\bFILIA[CÇ][AÃ]O\b", r"\bNASC\w*\b", r"\bNATURAL\b",
+    r"\bRESIDENTE\b", r"\bENDERE[CÇ]O\b",
+    r"\bCONFORME\b", r"\bREQUERID\w*\b", r"\bREQUERENTE\w*\b",
+    r"\bCERTID[ÃA]O\b", r"\bEMITID\w*\b", r"\bEXPEDID\w*\b",
+    r"\bPROCESSO\b", r"\bPORTADOR\b", r"\bPORTADORA\b",
+    r"\bEM\b", r"\bE\b"
+]
+# fim do nome: a vírgula ou a stopword que vier primeiro, numa só busca
+FIM_NOME_REGEX = re.compile("|".join([","] + [f"(?:{p})" for p in STOPWORDS_POS_NOME]))
+
+def _extract_nome(text: str, anchors_regexes: list[str], norm: str | None = None) -> tuple[str | None, bool]:
+    """
+    (nome, terminado): 'terminado' indica que a vírgula/stopword após o nome já apareceu.
+    Sem ela o nome é só o resto da linha, e a página seguinte ainda pode completá-lo.
+    """
+    if norm is None:
+        norm = normalize_text(text[:SEARCH_WINDOW])
+    up = norm[:SEARCH_WINDOW]
+    m = next(_iter_anchor_matches(tuple(anchors_regexes), up), None)
+    if m is None:
+        return None, False
+    start_pos = m.end()
     tail_up = up[start_pos:]
-    cut_positions = []
-    comma_pos = tail_up.find(',')
-    if comma_pos != -1:
-        cut_positions.append(comma_pos)
-    STOPWORDS_POS_NOME = [
-        r"\bCPF\b", r"\bRG\b", r"\bCNH\b", r"\bCTPS\b",
-        r"\bFILIA[CÇ][AÃ]O\b", r"\bNASC\w*\b", r"\bNATURAL\b",
-        r"\bRESIDENTE\b", r"\bENDERE[CÇ]O\b",
-        r"\bCONFORME\b", r"\bREQUERID\w*\b", r"\bREQUERENTE\w*\b",
-        r"\bCERTID[ÃA]O\b", r"\bEMITID\w*\b", r"\bEXPEDID\w*\b",
-        r"\bPROCESSO\b", r"\bPORTADOR\b", r"\bPORTADORA\b",
-        r"\bEM\b", r"\bE\b"
-    ]
-    for st in STOPWORDS_POS_NOME:
-        m = re.search(st, tail_up)
-        if m:
-            cut_positions.append(m.start())
-    if cut_positions:
-        cut_at = min([pos for pos in cut_positions if pos >= 0])
-        candidate = tail_up[:cut_at]
+    m = FIM_NOME_REGEX.search(tail_up)
+    if m:
+        candidate = tail_up[:m.start()]
     else:
         first_line = next((ln.strip() for ln in tail_up.splitlines() if ln.strip()), "")
         candidate = first_line
-    candidate = re.sub(r"[^A-Z \n]", " ", candidate)
-    candidate = re.sub(r"\s+", " ", candidate).strip()
-    return candidate if candidate else None
-
-def extract_oficio_num(text: str) -> str:
-    txt = strip_accents(text.upper())
-    if re.search(r"\b6[ºO]?\s*OFICIO\b", txt):
+    candidate = NON_ALPHA_REGEX.sub(" ", candidate)
+    candidate = WS_REGEX.sub(" ", candidate).strip()
+    return (candidate if candidate else None), m is not None
+
+def extract_nome_until_comma(text: str, anchors_regexes: list[str], norm: str | None = None) -> str | None:
+    return _extract_nome(text, anchors_regexes, norm)[0]
+
+def extract_oficio_num(text: str, norm: str | None = None) -> str:
+    txt = norm[:SEARCH_WINDOW] if norm is not None else normalize_text(text[:SEARCH_WINDOW])
+    if "OFICIO" not in txt:
+        return "5"  # sem a palavra não há o que a regex casar
+    if OFICIO_6_REGEX.search(txt):
         return "6"
     return "5"
 
 
 # ===================== Casos de renomeação =====================
 
-def rename_contratos(pdf: Path, outdir: Path):
-    text = read_pdf_text(pdf)
+def _plan_contratos(pdf: Path):
+    # o fallback do cabeçalho é fraco: só vale se nenhuma linha 'CONTRATO' resolver
+    text, norm, found = _scan_pdf(
+        pdf,
+        lambda t, n: (*extract_cpf_first_buyer(t, n), extract_contract_number(t, n, header_fallback=False)),
+        lambda r: r[0] and r[1] == "OK" and r[2],
+    )
     if not text:
-        return (pdf.name, "", "ERRO: PDF sem texto (digitalizado sem OCR?)")
-
-    cpf, status = extract_cpf_first_buyer(text)
-    contrato = extract_contract_number(text)
+        return (pdf.name, None, "ERRO: PDF sem texto (digitalizado sem OCR?)")
+    cpf, status, contrato = found
+    if not contrato:
+        contrato = extract_contract_number(text, norm)
 
     if not cpf:
-        return (pdf.name, "", status)
+        return (pdf.name, None, status)
     if not contrato:
-        return (pdf.name, "", "ERRO: Número de contrato (13 dígitos) não encontrado")
+        return (pdf.name, None, "ERRO: Número de contrato (13 dígitos) não encontrado")
 
-    novo = f"{cpf}_{contrato}.pdf"
-    dest = outdir / novo
-    i = 1
-    while dest.exists():
-        dest = outdir / f"{cpf}_{contrato}_{i}.pdf"
-        i += 1
-    shutil.copy2(pdf, dest)
-    return (pdf.name, dest.name, status)
+    return (pdf.name, (f"{cpf}_{contrato}.pdf", f"{cpf}_{contrato}_{{i}}.pdf"), status)
 
+def rename_contratos(pdf: Path, outdir: Path, link: bool = False):
+    return _emit_plan(pdf, outdir, _plan_contratos(pdf), link)
 
-def rename_certidoes_2(pdf: Path, outdir: Path):
-    text = read_pdf_text(pdf)
+
+# Âncoras do nome nas certidões, em ordem de prioridade
+NOME_ANCHORS_2 = [r"COM\s+REFERENCIA\s+AO\s+NOME\s+DE"]
+NOME_ANCHORS_5_6 = [
+    r"NADA\s+CONSTA\s+EM\s+NOME\s+DE",
+    r"EM\s+NOME\s+DE",
+]
+NADA_CONSTA_REGEX = re.compile(NOME_ANCHORS_5_6[0])
+
+def _plan_certidoes_2(pdf: Path):
+    # só para cedo com o nome já encerrado (vírgula/stopword); senão a próxima página pode continuá-lo
+    text, norm, found = _scan_pdf(
+        pdf,
+        lambda t, n: _extract_nome(t, NOME_ANCHORS_2, n),
+        lambda r: r[0] and r[1],
+    )
     if not text:
-        return (pdf.name, "", "ERRO: PDF sem texto (digitalizado sem OCR?)")
-    nome = extract_nome_until_comma(text, [
-        r"COM\s+REFERENCIA\s+AO\s+NOME\s+DE"
-    ])
+        return (pdf.name, None, "ERRO: PDF sem texto (digitalizado sem OCR?)")
+    nome, _ = found
     if not nome:
-        return (pdf.name, "", "ERRO: Nome não encontrado após 'COM REFERENCIA AO NOME DE' até a vírgula")
-    dest = outdir / f"{nome}-2.pdf"
-    i = 1
-    while dest.exists():
-        dest = outdir / f"{nome}-2.{i}.pdf"
-        i += 1
-    shutil.copy2(pdf, dest)
-    return (pdf.name, dest.name, "OK")
-
-def rename_certidoes_5_6(pdf: Path, outdir: Path):
-    text = read_pdf_text(pdf)
+        return (pdf.name, None, "ERRO: Nome não encontrado após 'COM REFERENCIA AO NOME DE' até a vírgula")
+    return (pdf.name, (f"{nome}-2.pdf", f"{nome}-2.{{i}}.pdf"), "OK")
+
+def rename_certidoes_2(pdf: Path, outdir: Path, link: bool = False):
+    return _emit_plan(pdf, outdir, _plan_certidoes_2(pdf), link)
+
+def _plan_certidoes_5_6(pdf: Path):
+    # Nome e ofício podem depender de páginas seguintes: um 'NADA CONSTA EM NOME DE' adiante
+    # tem prioridade sobre um 'EM NOME DE' já visto, e o '6º OFÍCIO' pode estar no rodapé ou
+    # na assinatura. Só para cedo com o nome pela âncora prioritária, já encerrado por
+    # vírgula/stopword, e o 6º ofício já achado; senão lê até o teto de páginas
+    # (sem '6º OFÍCIO' no que foi lido, fica 5).
+    text, norm, found = _scan_pdf(
+        pdf,
+        lambda t, n: (
+            *_extract_nome(t, NOME_ANCHORS_5_6, n),
+            extract_oficio_num(t, n),
+            NADA_CONSTA_REGEX.search(n[:SEARCH_WINDOW]) is not None,
+        ),
+        lambda r: r[0] and r[1] and r[2] == "6" and r[3],
+    )
     if not text:
-        return (pdf.name, "", "ERRO: PDF sem texto (digitalizado sem OCR?)")
-    nome = extract_nome_until_comma(text, [
-        r"NADA\s+CONSTA\s+EM\s+NOME\s+DE",
-        r"EM\s+NOME\s+DE",
-    ])
+        return (pdf.name, None, "ERRO: PDF sem texto (digitalizado sem OCR?)")
+    nome, _, oficio, _ = found
     if not nome:
-        return (pdf.name, "", "ERRO: Nome não encontrado após 'NADA CONSTA EM NOME DE/EM NOME DE' até a vírgula")
-    oficio = extract_oficio_num(text)
-    dest = outdir / f"{nome}-{oficio}.pdf"
-    i = 1
-    while dest.exists():
-        dest = outdir / f"{nome}-{oficio}.{i}.pdf"
-        i += 1
-    shutil.copy2(pdf, dest)
-    return (pdf.name, dest.name, "OK")
+        return (pdf.name, None, "ERRO: Nome não encontrado após 'NADA CONSTA EM NOME DE/EM NOME DE' até a vírgula")
+    return (pdf.name, (f"{nome}-{oficio}.pdf", f"{nome}-{oficio}.{{i}}.pdf"), "OK")
+
+def rename_certidoes_5_6(pdf: Path, outdir: Path, link: bool = False):
+    return _emit_plan(pdf, outdir, _plan_certidoes_5_6(pdf), link)
 
 
 # ===================== Interface (Tkinter) =====================
@@ -435,6 +807,15 @@ TEXT_DARK = "#1F2937"
 
 APP_VERSION = "0.0.5"
 
+# Resultados enviados à interface em lotes (a cada N arquivos ou intervalo em segundos)
+LOG_BATCH = 25
+LOG_BATCH_INTERVAL = 0.25
+# Atraso (ms) com que as linhas enfileiradas são desenhadas no log
+LOG_FLUSH_MS = 100
+
+# No Windows o ProcessPoolExecutor recusa max_workers > 61 (limite do WaitForMultipleObjects)
+WIN_MAX_WORKERS = 61
+
 class App:
     def __init__(self, master: Tk):
         self.master = master
@@ -458,6 +839,12 @@ class App:
         self._create_card("Certidões -2", "certidoes_2", 1)
         self._create_card("Certidões 5/6", "certidoes_5_6", 2)
 
+        # opcional (originais não precisam ser preservados): hardlink é instantâneo e não
+        # ocupa espaço, mas o renomeado e o original passam a ser o mesmo arquivo
+        self.link_mode = BooleanVar(value=False)
+        Checkbutton(master, text="Criar links em vez de cópias", variable=self.link_mode,
+                    bg=BG, fg=TEXT_DARK, activebackground=BG, font=("Segoe UI", 10)).pack()
+
         # botão executar
         self.run_btn = ttk.Button(master, text="Executar", command=self.run)
         self.run_btn.pack(pady=12)
@@ -472,6 +859,8 @@ class App:
         self.log.tag_config("warn", foreground="orange")
         self.log.tag_config("err", foreground="red")
         self.log.tag_config("normal", foreground=TEXT_DARK)
+        self._log_buf = []
+        self._log_flush_pending = False
 
         self.ensure_folders()
         self._apply_card_styles()
@@ -503,8 +892,23 @@ class App:
                 card.configure(highlightbackground="#D0E2FF")
 
     def _log_add(self, msg: str, tag: str = "normal"):
+        self._log_add_many([(msg, tag)])
+
+    def _log_add_many(self, entries: list[tuple[str, str]]):
+        """Enfileira linhas (texto, tag); o widget é atualizado no próximo _flush_log."""
+        self._log_buf.extend(entries)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.master.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self):
+        """Insere tudo o que chegou desde o último flush com um único insert/redesenho."""
+        self._log_flush_pending = False
+        entries, self._log_buf = self._log_buf, []
+        if not entries:
+            return
         self.log.configure(state="normal")
-        self.log.insert(END, msg, tag)
+        self.log.insert(END, *[x for entry in entries for x in entry])
         self.log.see(END)
         self.log.configure(state="disabled")
 
@@ -513,6 +917,7 @@ class App:
         for p in ["contratos", "certidoes_2", "certidoes_5_6"]:
             (base / "entrada" / p).mkdir(parents=True, exist_ok=True)
             (base / "saida" / p).mkdir(parents=True, exist_ok=True)
+        evict_text_cache()
         self._log_add("📁 Pastas verificadas/criadas nas pastas 'entrada' e 'saida'.\n", "normal")
 
     def run(self):
@@ -521,13 +926,14 @@ class App:
         entrada = base / "entrada" / mode
         saida = base / "saida" / mode
 
+        # os workers só extraem (_plan_*); a gravação fica no _process_batch
         fn = {
-            "contratos": rename_contratos,
-            "certidoes_2": rename_certidoes_2,
-            "certidoes_5_6": rename_certidoes_5_6
+            "contratos": _plan_contratos,
+            "certidoes_2": _plan_certidoes_2,
+            "certidoes_5_6": _plan_certidoes_5_6
         }[mode]
 
-        pdfs = sorted(entrada.glob("*.pdf"))
+        pdfs = list_pdfs(entrada)
         if not pdfs:
             self._log_add(f"⚠️ A pasta '{entrada}' está vazia. Nenhum PDF para processar.\n", "warn")
             return
@@ -535,63 +941,123 @@ class App:
         ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         xlsx_path = saida / f"renomeacao_log_{ts}.xlsx"
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Log Renomeação"
+        # processamento em segundo plano para não travar a janela
+        self.run_btn.configure(state="disabled")
+        self._ok = 0
+        threading.Thread(target=self._process_batch, args=(fn, pdfs, saida, xlsx_path, self.link_mode.get()), daemon=True).start()
+
+    def _process_batch(self, fn, pdfs: list[Path], saida: Path, xlsx_path: Path, link: bool = False):
+        """
+        Roda fora da thread do Tk: distribui a extração dos PDFs entre processos (até um
+        por núcleo) e grava as saídas aqui, na ordem de 'pdfs', para que os sufixos de nomes
+        repetidos não dependam de qual processo terminou primeiro. Cada resultado volta à
+        interface via master.after().
+        """
+        plans = {}
+        results = {}
+        pending = []
+        last_flush = time.monotonic()
+        failure = "ERRO: processamento interrompido"
+        try:
+            # retrato da pasta de saída: colisões com arquivos antigos resolvidas em memória
+            taken = {p.name for p in saida.iterdir()}
+            # não sobe mais processos do que arquivos (cada worker custa um spawn no Windows)
+            workers = min(len(pdfs), os.cpu_count() or 1)
+            if sys.platform == "win32":
+                workers = min(workers, WIN_MAX_WORKERS)
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futures = {ex.submit(fn, pdf): pdf for pdf in pdfs}
+                next_idx = 0
+                for fut in as_completed(futures):
+                    pdf = futures[fut]
+                    try:
+                        plans[pdf] = fut.result()
+                    except Exception as e:
+                        plans[pdf] = (pdf.name, None, f"ERRO: {e}")
+                    # grava tudo o que já tem os anteriores resolvidos
+                    while next_idx < len(pdfs) and pdfs[next_idx] in plans:
+                        cur = pdfs[next_idx]
+                        next_idx += 1
+                        try:
+                            row = _emit_plan(cur, saida, plans.pop(cur), link, taken)
+                        except OSError as e:
+                            row = (cur.name, "", f"ERRO: {e}")
+                        results[cur] = row
+                        pending.append(row)
+                    if pending and (len(pending) >= LOG_BATCH or time.monotonic() - last_flush >= LOG_BATCH_INTERVAL):
+                        self.master.after(0, self._report_results, pending)
+                        pending = []
+                        last_flush = time.monotonic()
+        except Exception as e:
+            # falha do lote (pasta de saída, criação do pool...): sem isso a thread morre calada
+            failure = f"ERRO: {e}"
+            self.master.after(0, self._log_add, f"❌ Falha no processamento: {e}\n", "err")
+        finally:
+            if pending:
+                self.master.after(0, self._report_results, pending)
+            # planilha na ordem original dos arquivos
+            rows = [results.get(pdf, (pdf.name, "", failure)) for pdf in pdfs]
+            self.master.after(0, self._finish_run, rows, xlsx_path)
+
+    def _report_results(self, rows: list[tuple[str, str, str]]):
+        entries = []
+        for orig, novo, status in rows:
+            if status == "OK":
+                entries.append((f"✅ {orig} → {novo}\n", "ok"))
+                self._ok += 1
+            elif isinstance(status, str) and status.startswith("⚠️"):
+                entries.append((f"{status} | {orig} → {novo}\n", "warn"))
+            else:
+                entries.append((f"❌ {orig} → {status}\n", "err"))
+        self._log_add_many(entries)
+
+    def _finish_run(self, rows: list[tuple[str, str, str]], xlsx_path: Path):
+        self.run_btn.configure(state="normal")
+        # planilha só de escrita: as linhas vão direto para o arquivo, sem objetos de célula em memória
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Log Renomeação")
         headers = ["Arquivo Original", "Nome Novo", "Status"]
-        ws.append(headers)
+
+        # ajustar colunas (no modo write_only as larguras precisam ser definidas antes das linhas)
+        for col_idx, values in enumerate(zip(headers, *rows), 1):
+            max_len = max(len(str(v)) if v is not None else 0 for v in values)
+            ws.column_dimensions[get_column_letter(col_idx)].width = max(10, min(80, max_len + 2))
 
         header_font = Font(bold=True)
         header_fill = PatternFill("solid", fgColor="DDEBFF")
         header_align = Alignment(horizontal="center", vertical="center")
         thin = Side(border_style="thin", color="D0D7E2")
-        for col_idx, h in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_idx, value=h)
+        border = Border(top=thin, left=thin, right=thin, bottom=thin)
+        err_font = Font(color="FF0000")
+        header_cells = []
+        for h in headers:
+            cell = WriteOnlyCell(ws, value=h)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_align
-            cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
-
-        ok = 0
-        for pdf in pdfs:
-            try:
-                orig, novo, status = fn(pdf, saida)
-            except Exception as e:
-                orig, novo, status = (pdf.name, "", f"ERRO: {e}")
-            ws.append([orig, novo, status])
-            if status == "OK":
-                self._log_add(f"✅ {orig} → {novo}\n", "ok")
-                ok += 1
-            elif isinstance(status, str) and status.startswith("⚠️"):
-                self._log_add(f"{status} | {orig} → {novo}\n", "warn")
-            else:
-                self._log_add(f"❌ {orig} → {status}\n", "err")
-
-        # ajustar colunas
-        for col_idx in range(1, ws.max_column + 1):
-            max_len = 0
-            for row_idx in range(1, ws.max_row + 1):
-                val = ws.cell(row=row_idx, column=col_idx).value
-                s = str(val) if val is not None else ""
-                if len(s) > max_len:
-                    max_len = len(s)
-            ws.column_dimensions[get_column_letter(col_idx)].width = max(10, min(80, max_len + 2))
-
-        # bordas & destaque erros
-        thin = Side(border_style="thin", color="D0D7E2")
-        for row_idx in range(2, ws.max_row + 1):
-            for col_idx in range(1, ws.max_column + 1):
-                c = ws.cell(row=row_idx, column=col_idx)
-                c.border = Border(top=thin, left=thin, right=thin, bottom=thin)
-                if col_idx == 3 and isinstance(c.value, str) and c.value.startswith("ERRO"):
-                    c.font = Font(color="FF0000")
+            cell.border = border
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        # bordas & destaque erros aplicados já na escrita de cada linha (estilos compartilhados)
+        for row in rows:
+            cells = []
+            for value in row:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.border = border
+                cells.append(cell)
+            status = row[2]
+            if isinstance(status, str) and status.startswith("ERRO"):
+                cells[2].font = err_font
+            ws.append(cells)
 
         wb.save(xlsx_path)
         self._log_add(f"\n📊 Log detalhado salvo em: {xlsx_path}\n", "normal")
-        self._log_add(f"\nConcluído. {ok} arquivos renomeados.\n", "ok")
+        self._log_add(f"\nConcluído. {self._ok} arquivos renomeados.\n", "ok")
 
 
 if __name__ == "__main__":
+    freeze_support()  # necessário para o ProcessPoolExecutor no .exe do PyInstaller
     root = Tk()
     app = App(root)
     root.mainloop()
\ No newline at end of file